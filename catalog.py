@@ -0,0 +1,9 @@
+# Default ingredient and requirement catalogs, shared (immutable) by all sessions.
+DEFAULT_INGREDIENTS = {
+    "생선": ("연어", "오징어", "고등어", "갈치"),
+    "고기": ("삼겹살", "차돌박이", "불고기", "닭가슴살"),
+    "야채": ("양파", "버섯", "당근", "대파", "감자"),
+    "냉동": ("너겟", "만두", "튀김", "돈까스"),
+    "기타": ("햄", "치즈", "진미채", "계란", "두부"),
+}
+DEFAULT_REQS = ("매운음식 X", "국물 요리 선호", "간단한 조리", "오븐 사용 X")
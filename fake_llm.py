@@ -0,0 +1,70 @@
+import os
+import re
+import json
+import time
+
+# Enable with FAKE_LLM=1 to run the app without a Gemini API key.
+# FAKE_LLM_LATENCY (seconds) simulates the model's response time.
+
+STYLES = ["볶음", "조림", "구이", "찌개", "덮밥", "샐러드", "파스타", "전", "튀김", "카레"]
+PLAN_LINE = re.compile(r"^\s*(월|화|수|목|금):\s*(.+?)\s*$", re.MULTILINE)
+INGREDIENTS_LINE = re.compile(r"Available Ingredients:\**\s*(.*)")
+
+
+def is_enabled():
+    return os.getenv("FAKE_LLM", "").lower() in ("1", "true", "yes")
+
+
+class FakeResponse:
+    def __init__(self, text):
+        self.text = text
+
+
+class FakeModel:
+    """Drop-in stand-in for genai.GenerativeModel used by the app and load tests."""
+
+    def __init__(self, latency=None):
+        if latency is None:
+            latency = float(os.getenv("FAKE_LLM_LATENCY", "0"))
+        self.latency = latency
+
+    def generate_content(self, prompt):
+        if self.latency:
+            time.sleep(self.latency)
+
+        if '"candidates"' in prompt:
+            data = {"candidates": self._candidates(prompt)}
+        elif '"recommendations"' in prompt:
+            data = {"recommendations": self._recommendations()}
+        else:
+            data = self._recipes(prompt)
+        return FakeResponse(json.dumps(data, ensure_ascii=False))
+
+    def _candidates(self, prompt):
+        match = INGREDIENTS_LINE.search(prompt)
+        ingredients = [i.strip() for i in match.group(1).split(",") if i.strip()] if match else []
+        if not ingredients:
+            ingredients = ["계란"]
+        return [f"{ingredients[i % len(ingredients)]} {STYLES[i]}" for i in range(10)]
+
+    def _recommendations(self):
+        return [
+            {"menu": f"추천 메뉴 {i}", "reason": "가볍게 먹기 좋아요", "tip": "따뜻할 때 드세요"}
+            for i in range(1, 11)
+        ]
+
+    def _recipes(self, prompt):
+        recipes = {}
+        for day, menu in PLAN_LINE.findall(prompt):
+            main = menu.split()[0]
+            recipes[day] = {
+                "재료": [f"{main} 200g", "양파 1개", "대파 1대", "간장 2큰술"],
+                "조리법": [
+                    f"{main}을(를) 손질합니다.",
+                    "양파와 대파를 썹니다.",
+                    "팬에 모두 넣고 10분간 익힙니다.",
+                    "간장으로 간을 맞춥니다.",
+                ],
+                "조리시간": "20분",
+            }
+        return recipes
@@ -0,0 +1,375 @@
+"""
+Concurrent-session load test for main.py.
+
+Starts one headless `streamlit run main.py` server backed by the local
+fake LLM, then drives N simulated browser sessions over Streamlit's
+websocket protocol through the real flow:
+toggle ingredients -> generate -> pick five -> confirm -> download PDF
+-> "메뉴를 추천해줘" tab.
+
+Reports per-step latency percentiles, server CPU/RSS and the first
+saturated level.
+
+Each session picks its own ingredients and menus (seeded by --seed, level
+and session index), and the server gets a fresh artifact store, so PDFs
+and recipes are really built instead of served from the shared cache.
+
+Requires requirements-dev.txt (websockets).
+
+Usage:
+    python loadtest.py --sessions 1 2 4 8 16 --latency 0.5
+"""
+import os
+import sys
+import time
+import socket
+import asyncio
+import random
+import shutil
+import argparse
+import tempfile
+import subprocess
+import threading
+import urllib.request
+from collections import defaultdict
+
+from streamlit.proto.BackMsg_pb2 import BackMsg
+from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+from streamlit.proto.WidgetStates_pb2 import WidgetState
+
+from catalog import DEFAULT_INGREDIENTS
+
+APP_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "main.py")
+CATALOG = [item for items in DEFAULT_INGREDIENTS.values() for item in items]
+INGREDIENTS_PER_SESSION = 4
+GENERATE_LABEL = "🚀 메뉴 10개 추천받기"
+CONFIRM_LABEL = "✅ 이 5가지 메뉴로 주간 식단 확정하기"
+DOWNLOAD_LABEL = "📄 PDF로 저장하기"
+RECOMMEND_INPUT_LABEL = "요구사항을 입력하세요"
+RECOMMEND_LABEL = "✨ 메뉴 추천받기"
+RECOMMEND_TEXT = "매운 국물 요리가 땡겨요"
+STEPS = ["load", "toggle", "generate", "pick", "confirm", "download_pdf", "recommend"]
+WIDGET_TYPES = ("button", "checkbox", "text_area", "text_input", "selectbox", "download_button")
+DONE = (ForwardMsg.FINISHED_SUCCESSFULLY, ForwardMsg.FINISHED_WITH_COMPILE_ERROR)
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile of a list of numbers."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(0, min(len(ordered) - 1, int(round(pct / 100 * len(ordered))) - 1))
+    return ordered[rank]
+
+
+# --- Server ---
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start_server(port, latency, artifact_dir):
+    env = dict(os.environ, FAKE_LLM="1", FAKE_LLM_LATENCY=str(latency), ARTIFACT_DIR=artifact_dir)
+    server = subprocess.Popen(
+        [sys.executable, "-m", "streamlit", "run", APP_PATH,
+         "--server.headless", "true",
+         "--server.port", str(port),
+         "--server.address", "127.0.0.1",
+         "--browser.gatherUsageStats", "false"],
+        env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    deadline = time.time() + 60
+    while time.time() < deadline:
+        if server.poll() is not None:
+            raise RuntimeError("streamlit server exited during startup")
+        try:
+            with urllib.request.urlopen(f"http://127.0.0.1:{port}/_stcore/health", timeout=1) as r:
+                if r.status == 200:
+                    return server
+        except OSError:
+            time.sleep(0.2)
+    server.kill()
+    raise RuntimeError("streamlit server did not become healthy")
+
+
+class ResourceSampler(threading.Thread):
+    """Samples the server process's CPU usage and RSS from /proc."""
+
+    def __init__(self, pid, interval=0.2):
+        super().__init__(daemon=True)
+        self.pid = pid
+        self.interval = interval
+        self.stop_event = threading.Event()
+        self.cpu_samples = []
+        self.peak_rss = 0
+        self.ticks = os.sysconf("SC_CLK_TCK")
+
+    def _cpu_seconds(self):
+        with open(f"/proc/{self.pid}/stat") as f:
+            fields = f.read().rsplit(")", 1)[1].split()
+        return (int(fields[11]) + int(fields[12])) / self.ticks  # utime + stime
+
+    def _rss_bytes(self):
+        with open(f"/proc/{self.pid}/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) * 1024
+        return 0
+
+    def run(self):
+        try:
+            last_wall, last_cpu = time.perf_counter(), self._cpu_seconds()
+            while not self.stop_event.wait(self.interval):
+                wall, cpu = time.perf_counter(), self._cpu_seconds()
+                self.cpu_samples.append(100 * (cpu - last_cpu) / (wall - last_wall))
+                last_wall, last_cpu = wall, cpu
+                self.peak_rss = max(self.peak_rss, self._rss_bytes())
+        except OSError:
+            pass
+
+    def stop(self):
+        self.stop_event.set()
+        self.join()
+
+
+# --- Simulated browser session ---
+
+class Session:
+    """Minimal Streamlit client: tracks widgets on the page and sends reruns."""
+
+    def __init__(self, base_url, timeout):
+        self.base_url = base_url
+        self.timeout = timeout
+        self.ws = None
+        self.widgets = {}  # widget id -> (type, element proto)
+        self.values = {}   # widget id -> WidgetState carrying a non-default value
+        self.exceptions = []
+
+    async def connect(self):
+        # Imported here so the module (and its stats helpers' tests) loads
+        # without the dev-only websocket client
+        import websockets
+
+        ws_url = self.base_url.replace("http", "ws", 1) + "/_stcore/stream"
+        self.ws = await websockets.connect(ws_url, subprotocols=["streamlit"], max_size=None)
+
+    async def close(self):
+        await self.ws.close()
+
+    def find(self, widget_type, label=None, key=None):
+        for widget_id, (kind, element) in self.widgets.items():
+            if kind != widget_type:
+                continue
+            if key is not None and widget_id.endswith(f"-{key}"):
+                return widget_id, element
+            if label is not None and element.label == label:
+                return widget_id, element
+        raise LookupError(f"{widget_type} not found: {label or key}")
+
+    def set_value(self, widget_id, **value):
+        self.values[widget_id] = WidgetState(id=widget_id, **value)
+
+    async def rerun(self, trigger_id=None):
+        msg = BackMsg()
+        msg.rerun_script.SetInParent()
+        states = msg.rerun_script.widget_states.widgets
+        for widget_id, state in self.values.items():
+            if widget_id in self.widgets:
+                states.append(state)
+        if trigger_id:
+            states.append(WidgetState(id=trigger_id, trigger_value=True))
+        await self.ws.send(msg.SerializeToString())
+        await asyncio.wait_for(self._read_until_finished(), self.timeout)
+
+    async def _read_until_finished(self):
+        while True:
+            fwd = ForwardMsg()
+            fwd.ParseFromString(await self.ws.recv())
+            kind = fwd.WhichOneof("type")
+            if kind == "new_session":
+                # Each script run redraws the page
+                self.widgets = {}
+            elif kind == "delta" and fwd.delta.WhichOneof("type") == "new_element":
+                element = fwd.delta.new_element
+                element_type = element.WhichOneof("type")
+                if element_type in WIDGET_TYPES:
+                    proto = getattr(element, element_type)
+                    self.widgets[proto.id] = (element_type, proto)
+                elif element_type == "exception":
+                    self.exceptions.append(element.exception.message)
+            elif kind == "script_finished" and fwd.script_finished in DONE:
+                return
+
+    async def click(self, label=None, key=None):
+        widget_id, _ = self.find("button", label=label, key=key)
+        await self.rerun(trigger_id=widget_id)
+
+    async def check(self, key):
+        widget_id, _ = self.find("checkbox", key=key)
+        self.set_value(widget_id, bool_value=True)
+        await self.rerun()
+
+    async def download(self, label):
+        _, element = self.find("download_button", label=label)
+        url = element.url if element.url.startswith("http") else self.base_url + element.url
+        data = await asyncio.to_thread(lambda: urllib.request.urlopen(url, timeout=self.timeout).read())
+        if not data:
+            raise RuntimeError("empty download")
+
+
+async def run_session(base_url, timings, errors, start_event, timeout, rng):
+    """Scripts one user through both tabs, recording latency per step."""
+    session = Session(base_url, timeout)
+    ingredients = rng.sample(CATALOG, INGREDIENTS_PER_SESSION)
+    picks = rng.sample(range(10), 5)
+
+    async def step(name, action):
+        start = time.perf_counter()
+        await action
+        timings[name].append(time.perf_counter() - start)
+        if session.exceptions:
+            raise RuntimeError(f"{name}: {session.exceptions[0]}")
+
+    try:
+        await session.connect()
+        await start_event.wait()
+        await step("load", session.rerun())
+        for item in ingredients:
+            await step("toggle", session.click(key=f"ing_{item}"))
+        await step("generate", session.click(label=GENERATE_LABEL))
+        for i in picks:
+            await step("pick", session.check(key=f"cand_{i}"))
+        await step("confirm", session.click(label=CONFIRM_LABEL))
+        await step("download_pdf", session.download(DOWNLOAD_LABEL))
+        text_area_id, _ = session.find("text_area", label=RECOMMEND_INPUT_LABEL)
+        session.set_value(text_area_id, string_value=RECOMMEND_TEXT)
+        await step("recommend", session.click(label=RECOMMEND_LABEL))
+    except Exception as e:
+        errors.append(f"{type(e).__name__}: {e}")
+    finally:
+        if session.ws:
+            await session.close()
+
+
+async def run_sessions(base_url, sessions, timeout, seed):
+    timings = defaultdict(list)
+    errors = []
+    start_event = asyncio.Event()
+    tasks = [
+        asyncio.create_task(run_session(
+            base_url, timings, errors, start_event, timeout,
+            random.Random(f"{seed}-{sessions}-{index}")
+        ))
+        for index in range(sessions)
+    ]
+    await asyncio.sleep(0.5)  # let every session connect first
+    start = time.perf_counter()
+    start_event.set()
+    await asyncio.gather(*tasks)
+    return timings, errors, time.perf_counter() - start
+
+
+def run_level(base_url, server_pid, sessions, timeout, seed):
+    sampler = ResourceSampler(server_pid)
+    sampler.start()
+    timings, errors, wall = asyncio.run(run_sessions(base_url, sessions, timeout, seed))
+    sampler.stop()
+
+    completed = sessions - len(errors)
+    return {
+        "sessions": sessions,
+        "wall": wall,
+        "throughput": completed / wall if wall else 0.0,
+        "timings": timings,
+        "errors": errors,
+        "cpu": max(sampler.cpu_samples, default=0.0),
+        "rss": sampler.peak_rss,
+    }
+
+
+def print_level(result):
+    print(f"\n=== {result['sessions']} concurrent sessions ===")
+    print(f"wall {result['wall']:.2f}s | {result['throughput']:.2f} flows/s | "
+          f"server peak CPU {result['cpu']:.0f}% | server peak RSS {result['rss'] / 2**20:.1f} MiB | "
+          f"errors {len(result['errors'])}")
+    print(f"{'step':<14}{'n':>6}{'p50':>10}{'p90':>10}{'p95':>10}{'p99':>10}{'max':>10}")
+    for name in STEPS:
+        values = result["timings"].get(name, [])
+        if not values:
+            continue
+        row = [percentile(values, p) for p in (50, 90, 95, 99)] + [max(values)]
+        print(f"{name:<14}{len(values):>6}" + "".join(f"{v * 1000:>8.0f}ms" for v in row))
+    for error in result["errors"][:3]:
+        print(f"  ! {error}")
+
+
+def find_saturation(results, max_p95, min_gain):
+    """
+    First level where any step's p95 exceeds max_p95, errors appear,
+    or throughput grows by less than min_gain over the previous level.
+    """
+    previous = None
+    for result in results:
+        worst_p95 = max((percentile(v, 95) for v in result["timings"].values()), default=0.0)
+        if result["errors"]:
+            return result["sessions"], "errors"
+        if worst_p95 > max_p95:
+            return result["sessions"], f"p95 {worst_p95:.2f}s > {max_p95:.2f}s"
+        if previous and result["throughput"] < previous["throughput"] * (1 + min_gain):
+            return result["sessions"], "throughput plateau"
+        previous = result
+    return None, None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Concurrent-session load test for main.py")
+    parser.add_argument("--sessions", type=int, nargs="+", default=[1, 2, 4, 8, 16],
+                        help="concurrent session counts to ramp through")
+    parser.add_argument("--latency", type=float, default=0.5,
+                        help="fake LLM latency per call in seconds")
+    parser.add_argument("--max-p95", type=float, default=None,
+                        help="p95 step latency (s) treated as saturated (default: latency + 2s)")
+    parser.add_argument("--min-gain", type=float, default=0.1,
+                        help="minimum relative throughput gain between levels")
+    parser.add_argument("--timeout", type=float, default=120,
+                        help="per-step timeout in seconds")
+    parser.add_argument("--port", type=int, default=None,
+                        help="server port (default: a free port)")
+    parser.add_argument("--seed", type=int, default=0,
+                        help="seed for each session's ingredient and menu picks")
+    args = parser.parse_args()
+
+    max_p95 = args.max_p95 if args.max_p95 is not None else args.latency + 2
+    port = args.port or free_port()
+    base_url = f"http://127.0.0.1:{port}"
+
+    print(f"Load test: {APP_PATH} on {base_url}")
+    print(f"fake LLM latency {args.latency}s | levels {args.sessions} | CPUs {os.cpu_count()}")
+
+    # Fresh artifact store so no PDF or recipe is served from an earlier run
+    artifact_dir = tempfile.mkdtemp(prefix="loadtest_artifacts_")
+    server = start_server(port, args.latency, artifact_dir)
+    results = []
+    try:
+        for sessions in args.sessions:
+            result = run_level(base_url, server.pid, sessions, args.timeout, args.seed)
+            print_level(result)
+            results.append(result)
+    finally:
+        server.terminate()
+        server.wait()
+        shutil.rmtree(artifact_dir, ignore_errors=True)
+
+    level, reason = find_saturation(results, max_p95, args.min_gain)
+    print("\n=== Summary ===")
+    if level:
+        print(f"Saturation at {level} concurrent sessions ({reason})")
+    else:
+        print(f"No saturation up to {args.sessions[-1]} concurrent sessions")
+    return 1 if any(r["errors"] for r in results) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
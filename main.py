@@ -2,6 +2,9 @@ import streamlit as st
 import pandas as pd
 from utils import generate_menu_candidates, generate_recipes, create_pdf
 from menu_recommender import run_menu_recommender
+from recipe_parser import parse_recipes, to_markdown, consolidate_shopping_list
+from catalog import DEFAULT_INGREDIENTS, DEFAULT_REQS
+from session_store import merge_catalog, store, render_memory_view
 
 # Set page config
 st.set_page_config(
@@ -53,18 +56,13 @@ st.markdown("""
 """, unsafe_allow_html=True)
 
 # 1. Initialize Session State
-if 'ingredients' not in st.session_state:
-    st.session_state.ingredients = {
-        "생선": ["연어", "오징어", "고등어", "갈치"],
-        "고기": ["삼겹살", "차돌박이", "불고기", "닭가슴살"],
-        "야채": ["양파", "버섯", "당근", "대파", "감자"],
-        "냉동": ["너겟", "만두", "튀김", "돈까스"],
-        "기타": ["햄", "치즈", "진미채", "계란", "두부"]
-    }
+# Defaults are shared across sessions; each session only keeps its own additions
+if 'custom_ingredients' not in st.session_state:
+    st.session_state.custom_ingredients = {}
 if 'selected_ingredients' not in st.session_state:
     st.session_state.selected_ingredients = set()
 if 'custom_reqs' not in st.session_state:
-    st.session_state.custom_reqs = ["매운음식 X", "국물 요리 선호", "간단한 조리", "오븐 사용 X"]
+    st.session_state.custom_reqs = []
 if 'selected_reqs' not in st.session_state:
     st.session_state.selected_reqs = set()
 
@@ -75,8 +73,20 @@ if 'selected_candidates' not in st.session_state:
     st.session_state.selected_candidates = [] # List of EXACTLY 5 selected items
 if 'final_plan' not in st.session_state:
     st.session_state.final_plan = {}
-if 'recipes' not in st.session_state:
-    st.session_state.recipes = {}
+if 'recipes_ref' not in st.session_state:
+    st.session_state.recipes_ref = None # Key into the shared artifact store
+
+ingredients = merge_catalog(DEFAULT_INGREDIENTS, st.session_state.custom_ingredients)
+custom_reqs = DEFAULT_REQS + tuple(st.session_state.custom_reqs)
+
+stored_recipes = store.get_json(st.session_state.recipes_ref) if st.session_state.recipes_ref else None
+if st.session_state.recipes_ref and stored_recipes is None:
+    # The stored plan expired; start over from step 1 instead of showing an empty plan
+    st.session_state.menu_candidates = []
+    st.session_state.selected_candidates = []
+    st.session_state.final_plan = {}
+    st.session_state.recipes_ref = None
+    st.warning("⚠️ 저장된 식단이 만료되었습니다. 재료를 다시 선택해주세요.")
 
 # --- Header ---
 st.title("🍳 주간 점심 메뉴 추천 (ver. 2.5)")
@@ -92,18 +102,18 @@ with tab1:
     with st.expander("➕ 직접 재료 추가하기", expanded=False):
         c1, c2, c3 = st.columns([1, 2, 1])
         with c1:
-            new_cat = st.selectbox("카테고리", list(st.session_state.ingredients.keys()))
+            new_cat = st.selectbox("카테고리", list(ingredients.keys()))
         with c2:
             new_item = st.text_input("재료명 입력")
         with c3:
             if st.button("추가", use_container_width=True):
-                if new_item and new_item not in st.session_state.ingredients[new_cat]:
-                    st.session_state.ingredients[new_cat].append(new_item)
+                if new_item and new_item not in ingredients[new_cat]:
+                    st.session_state.custom_ingredients.setdefault(new_cat, []).append(new_item)
                     st.rerun()
 
     # Ingredient Grid
-    cols = st.columns(len(st.session_state.ingredients) + 1)
-    for i, (category, items) in enumerate(st.session_state.ingredients.items()):
+    cols = st.columns(len(ingredients) + 1)
+    for i, (category, items) in enumerate(ingredients.items()):
         with cols[i]:
             st.markdown(f"<span class='ingredient-header'>{category}</span>", unsafe_allow_html=True)
             for item in items:
@@ -119,7 +129,7 @@ with tab1:
     # Requirements Column
     with cols[-1]:
         st.markdown("<span class='ingredient-header'>요구사항</span>", unsafe_allow_html=True)
-        for req in st.session_state.custom_reqs:
+        for req in custom_reqs:
             if st.checkbox(req, key=f"req_{req}"):
                 st.session_state.selected_reqs.add(req)
             elif req in st.session_state.selected_reqs:
@@ -127,7 +137,7 @@ with tab1:
                 
         new_req = st.text_input("직접 입력", key="new_req_input", placeholder="예: 저염식", label_visibility="collapsed")
         if st.button("요구사항 추가", key="add_req_btn"):
-            if new_req and new_req not in st.session_state.custom_reqs:
+            if new_req and new_req not in custom_reqs:
                 st.session_state.custom_reqs.append(new_req)
                 st.rerun()
 
@@ -151,13 +161,13 @@ with tab1:
                     st.session_state.menu_candidates = candidates
                     st.session_state.selected_candidates = [] # Reset selection
                     st.session_state.final_plan = {}
-                    st.session_state.recipes = {}
+                    st.session_state.recipes_ref = None
                     st.rerun()
                 else:
                     st.error("메뉴 생성에 실패했습니다. (API 확인 필요)")
 
     # --- Step 2: Candidate Selection ---
-    if st.session_state.menu_candidates and not st.session_state.recipes:
+    if st.session_state.menu_candidates and not st.session_state.recipes_ref:
         st.subheader("2️⃣ 메뉴 후보 10가지 중 5가지를 선택하세요")
         st.write(f"현재 선택된 개수: **{len(st.session_state.selected_candidates)}** / 5")
         
@@ -201,13 +211,15 @@ with tab1:
                         list(st.session_state.selected_ingredients)
                     )
                     if recipes:
-                        st.session_state.recipes = recipes
+                        st.session_state.recipes_ref = store.put_json(recipes)
                         st.rerun()
         elif len(st.session_state.selected_candidates) > 0:
             st.info("5개를 정확히 선택해야 확정할 수 있습니다.")
 
     # --- Step 3: Final View & Recipes ---
-    if st.session_state.recipes:
+    if st.session_state.recipes_ref:
+        # Parsed once (cached), then shared by the expanders, shopping list and PDF
+        recipes = parse_recipes(stored_recipes)
         st.success("🎉 이번 주 식단이 완성되었습니다!")
         
         st.subheader("📅 주간 식단표")
@@ -218,13 +230,15 @@ with tab1:
         days = ["월", "화", "수", "목", "금"]
         for day in days:
             menu_name = st.session_state.final_plan.get(day)
-            recipe_content = st.session_state.recipes.get(day, "레시피 없음")
+            recipe = recipes.get(day)
             
             with st.expander(f"**{day}요일**: {menu_name}"):
-                if isinstance(recipe_content, dict):
-                    st.write(recipe_content)
-                else:
-                    st.markdown(recipe_content)
+                st.markdown(to_markdown(recipe) if recipe else "레시피 없음")
+
+        st.subheader("🛒 장보기 목록")
+        shopping_list = consolidate_shopping_list(recipes.values())
+        if shopping_list:
+            st.table(pd.DataFrame(shopping_list, columns=["재료", "수량"]))
 
         c_back, c_down = st.columns([1, 1])
         with c_back:
@@ -232,11 +246,15 @@ with tab1:
                 st.session_state.menu_candidates = []
                 st.session_state.selected_candidates = []
                 st.session_state.final_plan = {}
-                st.session_state.recipes = {}
+                st.session_state.recipes_ref = None
                 st.rerun()
         
         with c_down:
-            pdf_bytes = create_pdf(st.session_state.final_plan, st.session_state.recipes)
+            # Built once per plan/recipes and shared via the disk store
+            pdf_bytes = store.memoize_bytes(
+                ["pdf", st.session_state.final_plan, st.session_state.recipes_ref],
+                lambda: create_pdf(st.session_state.final_plan, recipes)
+            )
             st.download_button(
                 label="📄 PDF로 저장하기",
                 data=pdf_bytes,
@@ -248,3 +266,4 @@ with tab1:
 with tab2:
     run_menu_recommender()
 
+render_memory_view(st.session_state)
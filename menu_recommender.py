@@ -1,5 +1,6 @@
 import streamlit as st
 from utils import get_gemini_model
+import prompt_builder
 
 def run_menu_recommender():
     st.header("🍽️ 메뉴를 부탁해")
@@ -23,10 +24,14 @@ def run_menu_recommender():
                 st.error("API 설정을 확인해주세요. (API Key Missing)")
                 return
 
-            prompt = f"""
+            # Repeated phrases are sent once; the tail is trimmed if over budget
+            phrases = prompt_builder.split_requirements(requirements)
+
+            def render(items):
+                return f"""
             Role: You are a helpful culinary expert.
             
-            User's Request: "{requirements}"
+            User's Request: "{', '.join(items)}"
             
             Task: Recommend exactly 10 distinct lunch menus based on the user's request.
             
@@ -50,6 +55,11 @@ def run_menu_recommender():
                 ]
             }}
             """
+
+            prompt, kept = prompt_builder.fit_to_budget(render, phrases)
+            if len(kept) < len(phrases):
+                st.warning(f"⚠️ 요구사항이 너무 길어 마지막 {len(phrases) - len(kept)}개 항목은 제외했습니다.")
+            prompt_builder.report("menu_recommender", prompt)
             
             try:
                 response = model.generate_content(prompt)
@@ -0,0 +1,144 @@
+import os
+import re
+import math
+from functools import lru_cache
+
+# Estimated prompt tokens allowed per request
+TOKEN_BUDGET = int(os.getenv("PROMPT_TOKEN_BUDGET", "1500"))
+
+# Keywords that show up in dish names for each catalog ingredient.
+# Custom ingredients are matched by their own name.
+INGREDIENT_KEYWORDS = {
+    "연어": ("연어", "사케"),
+    "오징어": ("오징어",),
+    "고등어": ("고등어",),
+    "갈치": ("갈치",),
+    "삼겹살": ("삼겹", "돼지", "제육", "보쌈", "수육", "포크"),
+    "차돌박이": ("차돌", "소고기", "우삼겹"),
+    "불고기": ("불고기", "소고기"),
+    "닭가슴살": ("닭", "치킨"),
+    "양파": ("양파", "어니언"),
+    "버섯": ("버섯",),
+    "당근": ("당근",),
+    "대파": ("대파", "파전"),
+    "감자": ("감자", "포테이토"),
+    "너겟": ("너겟", "너깃"),
+    "만두": ("만두",),
+    "튀김": ("튀김",),
+    "돈까스": ("돈까스", "돈가스", "카츠"),
+    "햄": ("햄", "부대", "스팸"),
+    "치즈": ("치즈",),
+    "진미채": ("진미채",),
+    "계란": ("계란", "달걀", "에그", "오믈렛", "스크램블"),
+    "두부": ("두부", "마파"),
+}
+# Dish-name words that contain an ingredient keyword without meaning it
+# ("햄버거" is not ham). They are masked out before matching.
+FALSE_FRIENDS = ("햄버거", "햄버그")
+
+HANGUL_CJK = re.compile(r"[\u1100-\u11ff\u3130-\u318f\uac00-\ud7af\u4e00-\u9fff]")
+
+
+def estimate_tokens(text):
+    """
+    Local token estimate (no API round trip): roughly one token per
+    Hangul/CJK character and one per four other non-space characters.
+    """
+    cjk = len(HANGUL_CJK.findall(text))
+    other = len(re.sub(r"\s", "", text)) - cjk
+    return cjk + math.ceil(other / 4)
+
+
+def report(name, prompt, budget=TOKEN_BUDGET):
+    """Prints the prompt's estimated token count before sending. Returns it."""
+    tokens = estimate_tokens(prompt)
+    status = "OVER BUDGET" if tokens > budget else "ok"
+    print(f"[prompt] {name}: ~{tokens} tokens (budget {budget}, {status})")
+    return tokens
+
+
+def _normalize(phrase):
+    return re.sub(r"\s+", " ", phrase).strip(" .,!?~\t").casefold()
+
+
+def dedupe_phrases(phrases):
+    """Drops empty and repeated phrases (ignoring case, spacing, trailing punctuation)."""
+    seen = set()
+    unique = []
+    for phrase in phrases:
+        key = _normalize(phrase)
+        if key and key not in seen:
+            seen.add(key)
+            unique.append(phrase.strip())
+    return unique
+
+
+def split_requirements(text):
+    """Splits free-text requirements into deduplicated phrases."""
+    return dedupe_phrases(re.split(r"[,\n]|(?<=[.!?])\s+", text))
+
+
+@lru_cache(maxsize=64)
+def _keyword_index(ingredients):
+    """keyword -> every selected ingredient it refers to."""
+    index = {}
+    for ingredient in ingredients:
+        for keyword in INGREDIENT_KEYWORDS.get(ingredient, ()) + (ingredient,):
+            if ingredient not in index.setdefault(keyword, ()):
+                index[keyword] += (ingredient,)
+    return index
+
+
+@lru_cache(maxsize=512)
+def _relevant(dish, ingredients):
+    """Ingredients named by the dish, or None if nothing in the name matches."""
+    for word in FALSE_FRIENDS:
+        dish = dish.replace(word, " ")
+    matched = []
+    for keyword, targets in _keyword_index(ingredients).items():
+        if keyword in dish:
+            matched.extend(i for i in targets if i not in matched)
+    return tuple(matched) or None
+
+
+def relevant_ingredients(dish, ingredients):
+    """
+    Selected ingredients the dish name refers to, or all of them when
+    nothing matches (e.g. a creative dish name).
+    """
+    ingredients = tuple(sorted(ingredients))
+    matched = _relevant(dish, ingredients)
+    return list(matched if matched is not None else ingredients)
+
+
+def fit_to_budget(render, items, budget=TOKEN_BUDGET, min_items=1):
+    """
+    Renders the prompt, dropping items from the end until the estimated
+    token count fits the budget (keeping at least min_items).
+    Returns (prompt, kept_items).
+    """
+    items = list(items)
+    prompt = render(items)
+    while estimate_tokens(prompt) > budget and len(items) > min_items:
+        items.pop()
+        prompt = render(items)
+    return prompt, items
+
+
+def rank_by_relevance(final_plan, ingredients):
+    """
+    Ingredients the planned dishes use, ordered by how many dishes use
+    them (most first). Ingredients no dish refers to are left out, unless
+    some dish matches nothing, in which case they are ranked last.
+    """
+    counts = {i: 0 for i in ingredients}
+    unmatched_dish = False
+    for menu in final_plan.values():
+        matched = _relevant(menu, tuple(sorted(ingredients)))
+        if matched is None:
+            unmatched_dish = True
+            continue
+        for ingredient in matched:
+            counts[ingredient] += 1
+    ranked = sorted(counts, key=lambda i: -counts[i])
+    return ranked if unmatched_dish else [i for i in ranked if counts[i]]
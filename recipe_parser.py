@@ -0,0 +1,220 @@
+import re
+import json
+from collections import namedtuple
+from functools import lru_cache
+from fractions import Fraction
+
+# Compact, immutable (and therefore hashable/cacheable) recipe form.
+Ingredient = namedtuple("Ingredient", ["name", "amount", "unit"])
+Recipe = namedtuple("Recipe", ["ingredients", "steps", "minutes", "notes"])
+
+SECTION_KEYS = {
+    "ingredients": ("재료", "ingredients"),
+    "steps": ("조리법", "만드는 법", "만드는법", "조리 방법", "조리방법", "steps", "instructions"),
+    "time": ("조리시간", "조리 시간", "소요시간", "소요 시간", "time", "cook_time"),
+}
+_KEYS = "|".join(re.escape(k) for keys in SECTION_KEYS.values() for k in keys)
+# A header either has a colon ("재료: ...", "**재료 (2인분)**: ...") or is a
+# bold or heading line on its own ("**재료**", "# 재료"). A plain bullet such
+# as "- 재료를 손질합니다." is content, not a header.
+_NOTE = r"(?:\s*\([^)]*\))?"  # "(2인분)" after the key
+HEADER = re.compile(
+    r"^\s*(?:#+\s*|[-*•]\s+)?\**\s*(" + _KEYS + r")" + _NOTE + r"\s*\**" + _NOTE + r"\s*[:：]\s*\**\s*"
+    r"|^\s*(?:#+\s*\**|\*\*)\s*(" + _KEYS + r")" + _NOTE + r"\s*\**" + _NOTE + r"\s*$",
+    re.IGNORECASE,
+)
+STEP_MARKER = re.compile(r"(?:^|\s)\d+[.)]\s+")
+_NUMBER = r"\d+(?:\.\d+)?(?:/\d+)?"
+# "감자 1~2개" is a range; the upper bound is what gets bought
+QUANTITY = re.compile(
+    r"^(?P<name>.+?)\s*(?:" + _NUMBER + r"\s*[~\-–]\s*)?(?P<amount>" + _NUMBER + r")\s*(?P<unit>[^\d\s()~\-–]*)$"
+)
+QUALITATIVE = ("약간", "적당량", "조금", "적당히", "한줌", "한 줌", "소량")
+MINUTES = re.compile(r"(\d+)\s*분")
+HOURS = re.compile(r"(\d+(?:\.\d+)?)\s*시간")
+
+
+def _section_of(header):
+    header = header.lower()
+    for section, keys in SECTION_KEYS.items():
+        if header in (k.lower() for k in keys):
+            return section
+    return None
+
+
+def parse_amount(text):
+    """'1/2' -> 0.5, '200' -> 200.0, None if it is not a number ('1/0')."""
+    try:
+        return float(Fraction(text)) if "/" in text else float(text)
+    except (ValueError, ZeroDivisionError):
+        return None
+
+
+def parse_ingredient(text):
+    text = text.strip(" -*•\t")
+    # "연어(200g)" -> "연어 200g"
+    text = re.sub(r"\s*\(([^)]*\d[^)]*)\)\s*$", r" \1", text)
+    match = QUANTITY.match(text)
+    amount = parse_amount(match["amount"]) if match else None
+    if amount is not None:
+        return Ingredient(match["name"].strip(), amount, match["unit"] or None)
+    for word in QUALITATIVE:
+        if text.endswith(" " + word):
+            return Ingredient(text[: -len(word)].strip(), None, word)
+    return Ingredient(text, None, None)
+
+
+def _split_ingredients(value):
+    if isinstance(value, dict):
+        # {"연어": "200g"} -> "연어 200g"
+        items = [f"{k} {v}" for k, v in value.items()]
+    elif isinstance(value, (list, tuple)):
+        items = [str(v) for v in value]
+    else:
+        items = re.split(r"[,\n]|(?:^|\s)[-•]\s", str(value))
+    return tuple(parse_ingredient(i) for i in items if i.strip(" -*•\t"))
+
+
+def _split_steps(value):
+    if isinstance(value, dict):
+        # {"1": "...", "2": "..."} or {"step1": ...}: numbered keys go in
+        # numeric order, so "10" comes after "9" even if the keys were sorted
+        numbers = [re.search(r"\d+", str(k)) for k in value]
+        if all(numbers):
+            pairs = sorted(zip((int(m.group()) for m in numbers), value.values()), key=lambda p: p[0])
+            value = [step for _, step in pairs]
+        else:
+            value = list(value.values())
+    if isinstance(value, (list, tuple)):
+        items = [str(v) for v in value]
+    else:
+        text = str(value)
+        items = STEP_MARKER.split(text) if STEP_MARKER.search(text) else text.split("\n")
+    steps = []
+    for item in items:
+        item = re.sub(r"^\s*(?:\d+[.)]|[-*•])\s*", "", item).strip()
+        if item:
+            steps.append(item)
+    return tuple(steps)
+
+
+def parse_minutes(text):
+    text = str(text)
+    if text.isdigit():
+        return int(text)
+    minutes = sum(int(m) for m in MINUTES.findall(text))
+    minutes += sum(round(float(h) * 60) for h in HOURS.findall(text))
+    return minutes or None
+
+
+def _estimate_minutes(steps):
+    """Sum of explicit durations mentioned in the steps, if any."""
+    return parse_minutes(" ".join(steps))
+
+
+def _from_sections(sections, notes=""):
+    steps = _split_steps(sections["steps"]) if sections.get("steps") else ()
+    minutes = parse_minutes(sections["time"]) if sections.get("time") else None
+    return Recipe(
+        ingredients=_split_ingredients(sections["ingredients"]) if sections.get("ingredients") else (),
+        steps=steps,
+        minutes=minutes or _estimate_minutes(steps),
+        notes=notes.strip(),
+    )
+
+
+@lru_cache(maxsize=512)
+def _parse_text(text):
+    sections = {}
+    notes = []
+    current = None
+    for line in text.splitlines():
+        match = HEADER.match(line)
+        if match:
+            current = _section_of(match.group(1) or match.group(2))
+            line = line[match.end():]
+        line = line.replace("**", "")
+        if current:
+            # A repeated header continues its section instead of replacing it
+            sections[current] = sections.get(current, "") + "\n" + line
+        elif line.strip():
+            notes.append(line.strip())
+    if not sections:
+        # Free-form text without headers: keep it as the steps
+        return _from_sections({"steps": text.replace("**", "")})
+    return _from_sections(sections, "\n".join(notes))
+
+
+@lru_cache(maxsize=512)
+def _parse_json(data):
+    value = json.loads(data)
+    sections = {}
+    notes = []
+    for key, item in value.items():
+        section = _section_of(str(key).strip())
+        if section:
+            sections.setdefault(section, item)
+        else:
+            notes.append(f"{key}: {item}")
+    return _from_sections(sections, "\n".join(notes))
+
+
+def parse_recipe(content):
+    """
+    Parses a recipe from model output (markdown text or dict) into a Recipe.
+    Results are cached, so repeated reruns and the PDF builder don't reparse.
+    """
+    if isinstance(content, Recipe):
+        return content
+    if isinstance(content, dict):
+        # Key order is kept so ingredients and steps stay in the model's order
+        return _parse_json(json.dumps(content, ensure_ascii=False))
+    return _parse_text(str(content))
+
+
+def parse_recipes(recipes):
+    return {day: parse_recipe(content) for day, content in recipes.items()}
+
+
+def format_amount(amount):
+    return f"{amount:g}" if amount is not None else ""
+
+
+def format_ingredient(ingredient):
+    quantity = f"{format_amount(ingredient.amount)}{ingredient.unit or ''}"
+    return f"{ingredient.name} {quantity}".strip()
+
+
+@lru_cache(maxsize=512)
+def to_markdown(recipe):
+    """Markdown for the Streamlit expander."""
+    parts = []
+    if recipe.ingredients:
+        parts.append("**재료**\n" + "\n".join(f"- {format_ingredient(i)}" for i in recipe.ingredients))
+    if recipe.steps:
+        parts.append("**조리법**\n" + "\n".join(f"{n}. {s}" for n, s in enumerate(recipe.steps, 1)))
+    if recipe.minutes:
+        parts.append(f"**조리시간**: 약 {recipe.minutes}분")
+    if recipe.notes:
+        parts.append(recipe.notes)
+    return "\n\n".join(parts) or "레시피 없음"
+
+
+def consolidate_shopping_list(recipes):
+    """
+    Merges ingredients across recipes into a shopping list.
+    Amounts with the same unit are summed; returns [(name, "200g + 1개"), ...].
+    """
+    totals = {}
+    for recipe in recipes:
+        for ingredient in parse_recipe(recipe).ingredients:
+            units = totals.setdefault(ingredient.name, {})
+            if ingredient.amount is None:
+                units.setdefault(ingredient.unit, None)
+            else:
+                units[ingredient.unit] = (units.get(ingredient.unit) or 0) + ingredient.amount
+    shopping_list = []
+    for name, units in totals.items():
+        quantities = [f"{format_amount(amount)}{unit or ''}" for unit, amount in units.items()]
+        shopping_list.append((name, " + ".join(q for q in quantities if q)))
+    return shopping_list
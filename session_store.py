@@ -0,0 +1,224 @@
+import os
+import sys
+import json
+import time
+import hashlib
+import tempfile
+import threading
+from functools import lru_cache
+
+import streamlit as st
+
+# Sessions not seen for this long are dropped from the accounting view
+SESSION_TTL = 60 * 60
+# Artifacts not read or written for this long are removed from disk
+ARTIFACT_TTL = 24 * 60 * 60
+# Reads only refresh an artifact's mtime once it is this old, so reruns
+# don't write file metadata every time
+TOUCH_AFTER = ARTIFACT_TTL / 8
+# How long the artifact store's disk usage figure is reused
+DISK_USAGE_TTL = 30
+# Setting MEMORY_VIEW_TOKEN turns on memory accounting. The view shows
+# server-wide data, so it is only rendered for ?admin=<token>.
+MEMORY_VIEW_TOKEN = os.getenv("MEMORY_VIEW_TOKEN")
+
+
+def merge_catalog(defaults, additions):
+    """Returns category -> items, sharing default tuples where nothing was added."""
+    merged = {}
+    for category, items in defaults.items():
+        extra = additions.get(category)
+        merged[category] = items + tuple(extra) if extra else items
+    return merged
+
+
+def _digest(data):
+    return hashlib.sha256(data).hexdigest()
+
+
+class ArtifactStore:
+    """
+    Content-addressed disk store for large per-session payloads
+    (recipes, PDFs). Sessions keep only the returned key, and identical
+    payloads from different sessions share one file.
+    """
+
+    def __init__(self, root):
+        self.root = root
+        os.makedirs(root, exist_ok=True)
+        self._last_prune = 0.0
+        self._lock = threading.Lock()
+        self._disk_usage = (0.0, (0, 0))  # (computed_at, (count, bytes))
+
+    def _path(self, key):
+        return os.path.join(self.root, key)
+
+    def put_bytes(self, data, key=None):
+        key = key or _digest(data)
+        path = self._path(key)
+        if not self._touch(key):
+            fd, tmp = tempfile.mkstemp(dir=self.root)
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp, path)
+        self._maybe_prune()
+        return key
+
+    def _touch(self, key):
+        """Marks an artifact as in use so pruning keeps it. False if it is gone."""
+        path = self._path(key)
+        try:
+            if time.time() - os.stat(path).st_mtime > TOUCH_AFTER:
+                os.utime(path)
+            return True
+        except FileNotFoundError:
+            return False
+
+    def get_bytes(self, key):
+        try:
+            with open(self._path(key), "rb") as f:
+                data = f.read()
+        except FileNotFoundError:
+            return None
+        self._touch(key)
+        return data
+
+    def put_json(self, obj):
+        # Key order is kept: recipe dicts are read back in the model's order
+        return self.put_bytes(json.dumps(obj, ensure_ascii=False).encode("utf-8"))
+
+    def get_json(self, key):
+        """Returns a fresh copy of the stored object, or None if it is gone."""
+        if not self._touch(key):
+            return None
+        try:
+            data = _read_cached(self, key)
+        except FileNotFoundError:
+            return None
+        return json.loads(data)
+
+    def memoize_bytes(self, parts, build):
+        """Returns build()'s output, stored under a key for parts and built only once."""
+        key = _digest(json.dumps(parts, ensure_ascii=False, sort_keys=True).encode("utf-8"))
+        data = self.get_bytes(key)
+        if data is None:
+            data = build()
+            self.put_bytes(data, key=key)
+        return data
+
+    def disk_usage(self):
+        """(count, bytes) of stored artifacts, rescanned at most every DISK_USAGE_TTL."""
+        computed_at, usage = self._disk_usage
+        if time.time() - computed_at < DISK_USAGE_TTL:
+            return usage
+        count, total = 0, 0
+        for entry in os.scandir(self.root):
+            if entry.is_file():
+                count += 1
+                total += entry.stat().st_size
+        self._disk_usage = (time.time(), (count, total))
+        return count, total
+
+    def _maybe_prune(self):
+        now = time.time()
+        with self._lock:
+            if now - self._last_prune < 60 * 60:
+                return
+            self._last_prune = now
+        for entry in os.scandir(self.root):
+            try:
+                if now - entry.stat().st_mtime > ARTIFACT_TTL:
+                    os.remove(entry.path)
+            except OSError:
+                pass
+
+
+@lru_cache(maxsize=128)
+def _read_cached(store, key):
+    # Misses raise instead of returning None, so lru_cache never caches them
+    with open(store._path(key), "rb") as f:
+        return f.read()
+
+
+store = ArtifactStore(
+    os.getenv("ARTIFACT_DIR") or os.path.join(tempfile.gettempdir(), "ai_menu_artifacts")
+)
+
+
+# --- Memory accounting ---
+
+_session_bytes = {}  # session_id -> (bytes, last_seen)
+_session_lock = threading.Lock()
+
+
+def deep_sizeof(obj, seen=None):
+    """Approximate bytes held by obj and everything it references."""
+    if seen is None:
+        seen = set()
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(deep_sizeof(k, seen) + deep_sizeof(v, seen) for k, v in obj.items())
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        size += sum(deep_sizeof(item, seen) for item in obj)
+    return size
+
+
+def _session_id():
+    try:
+        from streamlit.runtime.scriptrunner import get_script_run_ctx
+        ctx = get_script_run_ctx()
+        return ctx.session_id if ctx else None
+    except Exception:
+        return None
+
+
+def record_session(state):
+    """Records the current session's state size. Returns bytes."""
+    size = deep_sizeof(state.to_dict())
+    session_id = _session_id()
+    if session_id:
+        now = time.time()
+        with _session_lock:
+            _session_bytes[session_id] = (size, now)
+            for sid, (_, last_seen) in list(_session_bytes.items()):
+                if now - last_seen > SESSION_TTL:
+                    del _session_bytes[sid]
+    return size
+
+
+def memory_report():
+    """Returns per-session bytes, their total, and artifact store disk usage."""
+    with _session_lock:
+        sessions = {sid: size for sid, (size, _) in _session_bytes.items()}
+    count, disk = store.disk_usage()
+    return {
+        "sessions": sessions,
+        "total": sum(sessions.values()),
+        "artifacts": count,
+        "artifact_bytes": disk,
+    }
+
+
+def render_memory_view(state):
+    """
+    Records this session's size and, for admins, shows a sidebar view of
+    session memory and artifact store usage. No-op unless MEMORY_VIEW_TOKEN is set.
+    """
+    if not MEMORY_VIEW_TOKEN:
+        return
+    current_bytes = record_session(state)
+    if st.query_params.get("admin") != MEMORY_VIEW_TOKEN:
+        return
+    report = memory_report()
+    with st.sidebar.expander("🧮 메모리 사용량"):
+        st.metric("현재 세션", f"{current_bytes / 1024:.1f} KB")
+        st.metric(f"전체 세션 ({len(report['sessions'])}개)", f"{report['total'] / 1024:.1f} KB")
+        st.metric(f"디스크 저장소 ({report['artifacts']}개)", f"{report['artifact_bytes'] / 1024:.1f} KB")
+        if report["sessions"]:
+            st.table({
+                "세션": [sid[:8] for sid in report["sessions"]],
+                "KB": [round(size / 1024, 1) for size in report["sessions"].values()],
+            })
@@ -0,0 +1,43 @@
+from loadtest import percentile, find_saturation
+
+
+def _level(sessions, throughput, step_times=(0.1,), errors=()):
+    return {
+        "sessions": sessions,
+        "throughput": throughput,
+        "timings": {"generate": list(step_times)},
+        "errors": list(errors),
+    }
+
+
+def test_percentile_nearest_rank():
+    values = [10, 1, 9, 2, 8, 3, 7, 4, 6, 5]
+    assert percentile(values, 50) == 5
+    assert percentile(values, 90) == 9
+    assert percentile(values, 95) == 10
+    assert percentile(values, 100) == 10
+    assert percentile(values, 0) == 1
+    assert percentile([0.3], 99) == 0.3
+    assert percentile([], 95) == 0.0
+
+
+def test_no_saturation():
+    results = [_level(1, 1.0), _level(2, 1.9), _level(4, 3.5)]
+    assert find_saturation(results, max_p95=1.0, min_gain=0.1) == (None, None)
+
+
+def test_saturation_on_errors():
+    results = [_level(1, 1.0), _level(2, 1.9, errors=["TimeoutError: "])]
+    assert find_saturation(results, max_p95=1.0, min_gain=0.1) == (2, "errors")
+
+
+def test_saturation_on_p95():
+    results = [_level(1, 1.0), _level(2, 1.9), _level(4, 3.5, step_times=[0.1] * 18 + [2.0, 2.0])]
+    level, reason = find_saturation(results, max_p95=1.0, min_gain=0.1)
+    assert level == 4
+    assert reason.startswith("p95 2.00s")
+
+
+def test_saturation_on_throughput_plateau():
+    results = [_level(1, 1.0), _level(2, 1.9), _level(4, 2.0), _level(8, 4.0)]
+    assert find_saturation(results, max_p95=1.0, min_gain=0.1) == (4, "throughput plateau")
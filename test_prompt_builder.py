@@ -0,0 +1,62 @@
+from prompt_builder import (
+    estimate_tokens, dedupe_phrases, split_requirements, relevant_ingredients,
+    rank_by_relevance, fit_to_budget
+)
+
+PLAN = {"월": "연어 스테이크", "화": "제육볶음", "수": "마파두부", "목": "치즈 오믈렛", "금": "연어 덮밥"}
+SELECTED = ["연어", "삼겹살", "양파", "대파", "두부", "치즈", "계란"]
+
+
+def test_relevant_ingredients_by_keyword():
+    assert relevant_ingredients("제육볶음", SELECTED) == ["삼겹살"]
+    assert sorted(relevant_ingredients("치즈 오믈렛", SELECTED)) == ["계란", "치즈"]
+
+
+def test_hamburger_is_not_ham():
+    assert relevant_ingredients("소고기 햄버거", ["햄", "불고기"]) == ["불고기"]
+    assert relevant_ingredients("햄 볶음밥", ["햄", "양파"]) == ["햄"]
+    assert rank_by_relevance({"월": "소고기 햄버거 스테이크"}, ["햄", "불고기"]) == ["불고기"]
+
+
+def test_shared_keyword_maps_to_every_ingredient():
+    assert sorted(relevant_ingredients("소고기 무국", ["차돌박이", "불고기"])) == ["불고기", "차돌박이"]
+
+
+def test_unmatched_dish_keeps_everything():
+    assert sorted(relevant_ingredients("비빔밥", SELECTED)) == sorted(SELECTED)
+
+
+def test_rank_drops_unused_ingredients():
+    ranked = rank_by_relevance(PLAN, SELECTED)
+    assert ranked[0] == "연어"
+    assert set(ranked) == {"연어", "삼겹살", "두부", "치즈", "계란"}
+
+
+def test_context_never_larger_than_full_selection():
+    for plan in (PLAN, {"월": "비빔밥"}, {"월": "햄버거 스테이크", "화": "연어 구이"}):
+        ranked = rank_by_relevance(plan, SELECTED)
+        assert set(ranked) <= set(SELECTED)
+        assert estimate_tokens(", ".join(ranked)) <= estimate_tokens(", ".join(SELECTED))
+
+
+def test_dedupe_phrases():
+    assert dedupe_phrases(["국물", " 국물 ", "국물!", "", "Spicy", "spicy"]) == ["국물", "Spicy"]
+
+
+def test_split_requirements():
+    text = "매운거 싫어요. 매운거 싫어요! 국물, 국물 ,가벼운 거\n가벼운  거"
+    assert split_requirements(text) == ["매운거 싫어요.", "국물", "가벼운 거"]
+
+
+def test_fit_to_budget_trims_from_the_end():
+    render = lambda items: " ".join(items)
+    prompt, kept = fit_to_budget(render, ["가나", "다라", "마바"], budget=4)
+    assert kept == ["가나", "다라"]
+    assert prompt == "가나 다라"
+
+
+def test_fit_to_budget_keeps_min_items():
+    prompt, kept = fit_to_budget(lambda items: "가" * 100 + "".join(items), ["a", "b"], budget=10)
+    assert kept == ["a"]
+    _, kept = fit_to_budget(lambda items: "가" * 100, ["a", "b"], budget=10, min_items=0)
+    assert kept == []
@@ -0,0 +1,106 @@
+from recipe_parser import (
+    Ingredient, parse_recipe, parse_ingredient, to_markdown, consolidate_shopping_list
+)
+
+
+def test_markdown_with_bulleted_steps():
+    recipe = parse_recipe(
+        "**재료**: 연어 200g, 양파 1개, 소금 약간\n"
+        "**조리법**:\n"
+        "- 재료를 손질합니다.\n"
+        "- 팬에 굽습니다 10분."
+    )
+    assert recipe.ingredients == (
+        Ingredient("연어", 200.0, "g"),
+        Ingredient("양파", 1.0, "개"),
+        Ingredient("소금", None, "약간"),
+    )
+    assert recipe.steps == ("재료를 손질합니다.", "팬에 굽습니다 10분.")
+    assert recipe.minutes == 10
+
+
+def test_heading_only_and_numbered_steps():
+    recipe = parse_recipe("# 재료\n- 두부 1모\n## 만드는 법\n1. 자른다\n2. 끓인다\n**조리시간**\n15분")
+    assert recipe.ingredients == (Ingredient("두부", 1.0, "모"),)
+    assert recipe.steps == ("자른다", "끓인다")
+    assert recipe.minutes == 15
+
+
+def test_repeated_header_appends():
+    recipe = parse_recipe("재료: 김치 100g\n조리법: 1. 볶는다 2. 먹는다\n재료: 밥 1공기")
+    assert [i.name for i in recipe.ingredients] == ["김치", "밥"]
+    assert recipe.steps == ("볶는다", "먹는다")
+
+
+def test_free_text_becomes_steps():
+    recipe = parse_recipe("그냥 끓이세요.\n맛있게 드세요.")
+    assert recipe.ingredients == ()
+    assert recipe.steps == ("그냥 끓이세요.", "맛있게 드세요.")
+
+
+def test_dict_input():
+    recipe = parse_recipe({"재료": ["연어(200g)", "계란 2개"], "조리법": ["굽기", "5분 졸이기"], "조리시간": "20분"})
+    assert recipe.ingredients == (Ingredient("연어", 200.0, "g"), Ingredient("계란", 2.0, "개"))
+    assert recipe.steps == ("굽기", "5분 졸이기")
+    assert recipe.minutes == 20
+
+
+def test_dict_of_ingredients():
+    recipe = parse_recipe({"재료": {"연어": "200g", "양파": "1/2개"}, "조리법": ["굽기"]})
+    assert recipe.ingredients == (Ingredient("연어", 200.0, "g"), Ingredient("양파", 0.5, "개"))
+
+
+def test_amounts():
+    assert parse_ingredient("양파 1/2개") == Ingredient("양파", 0.5, "개")
+    assert parse_ingredient("간장 2큰술") == Ingredient("간장", 2.0, "큰술")
+    assert parse_ingredient("후추 적당량") == Ingredient("후추", None, "적당량")
+    assert parse_ingredient("김") == Ingredient("김", None, None)
+
+
+def test_shopping_list_totals():
+    monday = {"재료": ["양파 1/2개", "간장 2큰술", "소금 약간"], "조리법": ["a"]}
+    tuesday = "**재료**: 양파 1개, 간장 1큰술, 소금 약간, 연어 200g\n**조리법**: 1. b"
+    assert consolidate_shopping_list([monday, tuesday]) == [
+        ("양파", "1.5개"),
+        ("간장", "3큰술"),
+        ("소금", "약간"),
+        ("연어", "200g"),
+    ]
+
+
+def test_to_markdown():
+    recipe = parse_recipe({"재료": ["연어 200g"], "조리법": ["굽기"], "조리시간": "20분"})
+    assert to_markdown(recipe) == "**재료**\n- 연어 200g\n\n**조리법**\n1. 굽기\n\n**조리시간**: 약 20분"
+
+
+def test_numbered_step_keys_in_numeric_order():
+    steps = {f"step{n}": f"s{n}" for n in (1, 10, 11, 2)}
+    assert parse_recipe({"조리법": steps}).steps == ("s1", "s2", "s10", "s11")
+
+
+def test_order_survives_artifact_store(tmp_path):
+    from session_store import ArtifactStore
+    store = ArtifactStore(str(tmp_path))
+    recipes = {"월": {
+        "재료": {"양파": "1개", "간장": "2큰술"},
+        "조리법": {str(n): f"s{n}" for n in range(1, 12)},
+    }}
+    recipe = parse_recipe(store.get_json(store.put_json(recipes))["월"])
+    assert [i.name for i in recipe.ingredients] == ["양파", "간장"]
+    assert recipe.steps == tuple(f"s{n}" for n in range(1, 12))
+
+
+def test_header_with_serving_note():
+    recipe = parse_recipe("**재료 (2인분)**: 연어 200g, 양파 1개\n## 조리법 (2인분)\n1. 굽는다")
+    assert recipe.ingredients == (Ingredient("연어", 200.0, "g"), Ingredient("양파", 1.0, "개"))
+    assert recipe.steps == ("굽는다",)
+    assert recipe.notes == ""
+
+
+def test_range_takes_upper_bound():
+    assert parse_ingredient("감자 1~2개") == Ingredient("감자", 2.0, "개")
+    assert parse_ingredient("고추 1-2 개") == Ingredient("고추", 2.0, "개")
+
+
+def test_bad_amount_does_not_raise():
+    assert parse_ingredient("x 1/0") == Ingredient("x 1/0", None, None)
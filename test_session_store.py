@@ -0,0 +1,103 @@
+import os
+import time
+
+import session_store
+from session_store import ArtifactStore, ARTIFACT_TTL, TOUCH_AFTER, merge_catalog, deep_sizeof
+
+
+def _age(store, key, seconds):
+    old = time.time() - seconds
+    os.utime(store._path(key), (old, old))
+
+
+def test_json_round_trip_returns_fresh_copies(tmp_path):
+    store = ArtifactStore(str(tmp_path))
+    key = store.put_json({"월": {"재료": ["연어 200g"]}})
+    first = store.get_json(key)
+    first["월"]["재료"].append("changed")
+    assert store.get_json(key) == {"월": {"재료": ["연어 200g"]}}
+
+
+def test_get_json_after_file_removed(tmp_path):
+    store = ArtifactStore(str(tmp_path))
+    key = store.put_json({"a": 1})
+    assert store.get_json(key) == {"a": 1}  # now held by _read_cached
+    os.remove(store._path(key))
+    assert store.get_json(key) is None
+    store.put_json({"a": 1})
+    assert store.get_json(key) == {"a": 1}
+
+
+def test_missing_key(tmp_path):
+    store = ArtifactStore(str(tmp_path))
+    assert store.get_json("missing") is None
+    assert store.get_bytes("missing") is None
+
+
+def test_memoize_bytes_rebuilds_after_prune(tmp_path):
+    store = ArtifactStore(str(tmp_path))
+    calls = []
+
+    def build():
+        calls.append(1)
+        return b"pdf"
+
+    assert store.memoize_bytes(["pdf", {"월": "연어"}], build) == b"pdf"
+    assert store.memoize_bytes(["pdf", {"월": "연어"}], build) == b"pdf"
+    assert len(calls) == 1
+    for entry in os.scandir(tmp_path):
+        os.remove(entry.path)
+    assert store.memoize_bytes(["pdf", {"월": "연어"}], build) == b"pdf"
+    assert len(calls) == 2
+
+
+def test_prune_honors_ttl(tmp_path):
+    store = ArtifactStore(str(tmp_path))
+    stale = store.put_bytes(b"stale")
+    fresh = store.put_bytes(b"fresh")
+    _age(store, stale, ARTIFACT_TTL + 60)
+    _age(store, fresh, ARTIFACT_TTL - 60)
+    store._last_prune = 0.0
+    store._maybe_prune()
+    assert store.get_bytes(stale) is None
+    assert store.get_bytes(fresh) == b"fresh"
+
+
+def test_reads_refresh_mtime_only_when_old(tmp_path):
+    store = ArtifactStore(str(tmp_path))
+    key = store.put_json({"a": 1})
+    _age(store, key, 10)
+    before = os.stat(store._path(key)).st_mtime
+    store.get_json(key)
+    assert os.stat(store._path(key)).st_mtime == before
+    _age(store, key, TOUCH_AFTER + 60)
+    store.get_json(key)
+    assert time.time() - os.stat(store._path(key)).st_mtime < 60
+
+
+def test_disk_usage_is_cached(tmp_path, monkeypatch):
+    store = ArtifactStore(str(tmp_path))
+    store.put_bytes(b"12345")
+    assert store.disk_usage() == (1, 5)
+    store.put_bytes(b"678")
+    assert store.disk_usage() == (1, 5)
+    monkeypatch.setattr(session_store, "DISK_USAGE_TTL", 0)
+    assert store.disk_usage() == (2, 8)
+
+
+def test_merge_catalog_shares_default_tuples():
+    defaults = {"육류": ("삼겹살",), "채소": ("양파",)}
+    merged = merge_catalog(defaults, {"채소": ["깻잎"]})
+    assert merged["육류"] is defaults["육류"]
+    assert merged["채소"] == ("양파", "깻잎")
+    assert defaults["채소"] == ("양파",)
+
+
+def test_deep_sizeof():
+    shared = "x" * 1000
+    assert deep_sizeof({"a": [shared]}) > 1000
+    # Shared objects and cycles are counted once
+    assert deep_sizeof([shared, shared]) < 2000
+    loop = []
+    loop.append(loop)
+    assert deep_sizeof(loop) > 0
@@ -14,6 +14,8 @@ load_dotenv(env_path)
 import streamlit as st
 
 import streamlit as st
+import fake_llm
+import prompt_builder
 
 def get_api_key():
     """Try to get API key from environment variables or streamlit secrets."""
@@ -33,6 +35,10 @@ def get_api_key():
 
 def get_gemini_model():
     """Returns the configured Gemini model."""
+    # Local fake model for offline runs and load tests
+    if fake_llm.is_enabled():
+        return fake_llm.FakeModel()
+
     api_key = get_api_key()
     
     if not api_key:
@@ -57,10 +63,13 @@ def generate_menu_candidates(ingredients, requirements):
         print("API Key missing or invalid.")
         return []
 
-    prompt = f"""
+    requirements = prompt_builder.dedupe_phrases(requirements)
+
+    def render(items):
+        return f"""
     You are a professional chef.
     
-    **Available Ingredients:** {', '.join(ingredients)}
+    **Available Ingredients:** {', '.join(items)}
     **Dietary Requirements:** {', '.join(requirements)}
     
     **Goal:** Create exactly 10 distinct lunch menu names.
@@ -78,6 +87,11 @@ def generate_menu_candidates(ingredients, requirements):
     }}
     """
 
+    prompt, kept = prompt_builder.fit_to_budget(render, ingredients)
+    if len(kept) < len(ingredients):
+        st.warning(f"⚠️ 재료가 너무 많아 {len(ingredients) - len(kept)}개는 제외하고 추천합니다.")
+    prompt_builder.report("menu_candidates", prompt)
+
     try:
         response = model.generate_content(prompt)
         text = response.text
@@ -102,26 +116,37 @@ def generate_recipes(final_plan, ingredients):
         return {day: "API Key verifying... (Mock Recipe: Boil water, add stuff.)" for day in final_plan}
 
     plan_str = "\n".join([f"{day}: {menu}" for day, menu in final_plan.items()])
-    
-    prompt = f"""
+
+    def render(items):
+        return f"""
     You are a professional chef.
     Here is the final weekly lunch plan:
     {plan_str}
     
-    Available ingredients: {', '.join(ingredients)}
+    Available ingredients: {', '.join(items)}
     
     Please provide a simple recipe for each dish.
     **IMPORTANT: Provide all text (ingredients and instructions) in Korean.**
     
-    Format the output as a JSON object where keys are the days (월, 화, 수, 목, 금) and values are the recipe text (including ingredients needed and simple steps).
+    Format the output as a JSON object where keys are the days (월, 화, 수, 목, 금) and values are objects with:
+    - "재료": list of ingredients, each as "name quantity" (e.g. "연어 200g", "양파 1개", "소금 약간")
+    - "조리법": list of short steps in order
+    - "조리시간": total cooking time (e.g. "20분")
     
     Example JSON:
     {{
-        "월": "**재료**: ...\n**조리법**: 1. ... 2. ...",
+        "월": {{"재료": ["연어 200g", "양파 1개"], "조리법": ["...", "..."], "조리시간": "20분"}},
         ...
     }}
     """
 
+    # Only the selected ingredients the planned dishes actually use
+    ranked = prompt_builder.rank_by_relevance(final_plan, ingredients)
+    prompt, kept = prompt_builder.fit_to_budget(render, ranked, min_items=0)
+    if len(kept) < len(ranked):
+        st.warning(f"⚠️ 재료가 너무 많아 {len(ranked) - len(kept)}개는 제외하고 레시피를 만듭니다.")
+    prompt_builder.report("recipes", prompt)
+
     try:
         response = model.generate_content(prompt)
         text = response.text
@@ -134,21 +159,19 @@ def generate_recipes(final_plan, ingredients):
         print(f"Error generating recipes: {e}")
         return None
 import io
+from functools import lru_cache
+from xml.sax.saxutils import escape
 from reportlab.lib.pagesizes import A4
 from reportlab.pdfbase import pdfmetrics
 from reportlab.pdfbase.ttfonts import TTFont
 from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib import colors
+from recipe_parser import parse_recipe, format_ingredient, consolidate_shopping_list
 
-def create_pdf(plan, recipes):
-    """
-    Generates a PDF file with the weekly menu and recipes.
-    Returns bytes.
-    """
-    buffer = io.BytesIO()
-    
-    # helper to register font
+@lru_cache(maxsize=1)
+def _register_font():
+    """Registers the Korean font once per process. Returns the font name."""
     font_name = 'MalgunGothic'
     try:
         # Try standard Windows path first
@@ -160,11 +183,12 @@ def create_pdf(plan, recipes):
         except:
             print("Korean font not found. Fallback to standard font (Korean may not show).")
             font_name = 'Helvetica' # Fallback
+    return font_name
 
-    doc = SimpleDocTemplate(buffer, pagesize=A4)
-    story = []
-    
-    # Styles
+@lru_cache(maxsize=1)
+def _pdf_styles():
+    """Returns (title, heading, body) styles, built once per process."""
+    font_name = _register_font()
     styles = getSampleStyleSheet()
     # Create a custom style for the header and body using the registered font
     title_style = ParagraphStyle(
@@ -194,6 +218,39 @@ def create_pdf(plan, recipes):
     else:
         body_style = styles['Normal']
         heading_style = styles['Heading2']
+    return title_style, heading_style, body_style
+
+@lru_cache(maxsize=256)
+def _day_markup(day, menu_name, recipe):
+    """
+    Paragraph markup for one day, built from the parsed recipe. Cached per
+    (day, menu, recipe); ReportLab still lays out every day on each build.
+    """
+    header = escape(f"{day}요일: {menu_name}")
+    lines = []
+    if recipe.ingredients:
+        lines.append("<b>재료</b>: " + escape(", ".join(format_ingredient(i) for i in recipe.ingredients)))
+    if recipe.steps:
+        lines.append("<b>조리법</b>")
+        lines.extend(escape(f"{n}. {step}") for n, step in enumerate(recipe.steps, 1))
+    if recipe.minutes:
+        lines.append(f"<b>조리시간</b>: 약 {recipe.minutes}분")
+    if recipe.notes:
+        lines.append(escape(recipe.notes).replace('\n', '<br/>'))
+    return header, '<br/>'.join(lines) or "레시피 없음"
+
+def create_pdf(plan, recipes):
+    """
+    Generates a PDF file with the weekly menu, recipes and shopping list.
+    Recipes may be raw model output or parsed Recipe objects.
+    The whole document is laid out on every call (pagination depends on
+    every day before it); identical PDFs are reused via the artifact store.
+    Returns bytes.
+    """
+    buffer = io.BytesIO()
+    doc = SimpleDocTemplate(buffer, pagesize=A4)
+    title_style, heading_style, body_style = _pdf_styles()
+    story = []
 
     # Title
     story.append(Paragraph("주간 점심 메뉴 및 레시피", title_style))
@@ -201,29 +258,25 @@ def create_pdf(plan, recipes):
     
     # Content
     days = ["월", "화", "수", "목", "금"]
+    parsed = []
     for day in days:
         menu_name = plan.get(day, "메뉴 없음")
-        recipe_content = recipes.get(day, "레시피 없음")
-        
-        # Day Header
-        story.append(Paragraph(f"{day}요일: {menu_name}", heading_style))
-        
-        # Recipe Body
-        # If recipe_content is dict, convert to string (though current implementation returns string usually, prompt asks for string in JSON)
-        # But previous prompt example showed JSON structure for recipe text.
-        # Let's handle string with newlines.
-        if isinstance(recipe_content, dict):
-            # Fallback if it parses as dict
-            text = str(recipe_content)
+        if day in recipes:
+            recipe = parse_recipe(recipes[day])
+            parsed.append(recipe)
+            header, body = _day_markup(day, menu_name, recipe)
         else:
-            text = str(recipe_content)
-            
-        # Replace newlines with <br/> for Paragraph
-        formatted_text = text.replace('\n', '<br/>')
-        
-        story.append(Paragraph(formatted_text, body_style))
-        story.append(Spacer(1, 12))
-        story.append(Spacer(1, 12)) # Extra space between days
+            header, body = escape(f"{day}요일: {menu_name}"), "레시피 없음"
+        story.append(Paragraph(header, heading_style))
+        story.append(Paragraph(body, body_style))
+        story.append(Spacer(1, 24)) # Extra space between days
+
+    # Shopping list for the week, computed locally from the parsed recipes
+    shopping_list = consolidate_shopping_list(parsed)
+    if shopping_list:
+        story.append(Paragraph("장보기 목록", heading_style))
+        items = [escape(f"{name} {quantity}".strip()) for name, quantity in shopping_list]
+        story.append(Paragraph('<br/>'.join(items), body_style))
 
     doc.build(story)
     buffer.seek(0)